@@ -23,6 +23,7 @@ Pull the model first:  ollama pull qwen2.5:32b-instruct-q4_k_m
 
 from __future__ import annotations
 
+import functools
 import logging
 
 import httpx
@@ -30,31 +31,57 @@ from langchain_ollama import ChatOllama
 
 from config import (
     OLLAMA_BASE_URL,
-    OLLAMA_MODEL,
+    OLLAMA_CHAT_MODEL,
+    OLLAMA_KEEP_ALIVE,
     OLLAMA_NUM_CTX,
     OLLAMA_TEMPERATURE,
+    OLLAMA_TOOL_MODEL,
 )
 
 logger = logging.getLogger("agent.llm_config")
 
+# Which model serves each role: "tool" turns pick the next tool call,
+# "chat" turns write the user-facing answer.
+_ROLE_MODELS = {"tool": OLLAMA_TOOL_MODEL, "chat": OLLAMA_CHAT_MODEL}
 
-def get_llm() -> ChatOllama:
-    """Return a configured ChatOllama instance.
+
+def get_llm(role: str = "chat") -> ChatOllama:
+    """Return the shared, configured ChatOllama instance for *role*.
 
     Returns a BaseChatModel, which is required by ``create_agent``
     and supports ``.bind_tools()`` for ReAct-style tool calling.
+    One instance (and HTTP client) is created per model, so both roles
+    share an instance when they use the same model.  Every instance uses
+    ``OLLAMA_NUM_CTX``: Ollama reloads the model whenever ``num_ctx``
+    changes, which costs far more than a smaller window saves.
+
+    Args:
+        role: ``"chat"`` (OLLAMA_CHAT_MODEL) or ``"tool"`` (OLLAMA_TOOL_MODEL).
 
     Usage::
 
         llm = get_llm()
         result = llm.invoke("Hello")
     """
-    logger.info("Creating ChatOllama: model=%s base_url=%s", OLLAMA_MODEL, OLLAMA_BASE_URL)
+    try:
+        model = _ROLE_MODELS[role]
+    except KeyError:
+        raise ValueError(f"Unknown LLM role {role!r}; expected 'chat' or 'tool'") from None
+    return _create_llm(model)
+
+
+@functools.lru_cache(maxsize=2)
+def _create_llm(model: str) -> ChatOllama:
+    logger.info(
+        "Creating ChatOllama: model=%s base_url=%s num_ctx=%d",
+        model, OLLAMA_BASE_URL, OLLAMA_NUM_CTX,
+    )
     return ChatOllama(
-        model=OLLAMA_MODEL,
+        model=model,
         base_url=OLLAMA_BASE_URL,
         temperature=OLLAMA_TEMPERATURE,
         num_ctx=OLLAMA_NUM_CTX,
+        keep_alive=OLLAMA_KEEP_ALIVE,
     )
 
 
@@ -68,7 +95,7 @@ def test_connection() -> bool:
     try:
         response = llm.invoke("Reply with exactly: OK")
         logger.info("Ollama responded: %s", response.content.strip()[:80])
-        print(f"[OK] Ollama connected — model {OLLAMA_MODEL} is responding")
+        print(f"[OK] Ollama connected — model {OLLAMA_CHAT_MODEL} is responding")
         return True
     except httpx.ConnectError as exc:
         # Connection refused - Ollama not running
@@ -80,7 +107,7 @@ def test_connection() -> bool:
         # HTTP error (404 = model not found, etc.)
         print(f"[FAIL] Ollama returned HTTP error: {exc.response.status_code}")
         if exc.response.status_code == 404:
-            print(f"  -> Model not pulled?  Run:  ollama pull {OLLAMA_MODEL}")
+            print(f"  -> Model not pulled?  Run:  ollama pull {OLLAMA_CHAT_MODEL}")
         else:
             print(f"  -> Error: {exc}")
         logger.error("Ollama HTTP error: %s", exc)
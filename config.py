@@ -12,16 +12,21 @@ Environment Variables:
     Server Configuration:
         MCP_SERVER_HOST     - MCP server bind address (default: 127.0.0.1)
         MCP_SERVER_PORT     - MCP server port (default: 8000)
+        MCP_HTTP2           - Agent talks HTTP/2 to the MCP server (default: false)
 
     Ollama Configuration:
         OLLAMA_HOST         - Ollama server hostname (default: localhost)
         OLLAMA_PORT         - Ollama server port (default: 11434)
         OLLAMA_MODEL        - Model name (default: qwen2.5:32b-instruct-q4_k_m)
+        OLLAMA_TOOL_MODEL   - Model that picks tools (default: OLLAMA_MODEL)
+        OLLAMA_CHAT_MODEL   - Model that writes answers (default: OLLAMA_MODEL)
         OLLAMA_TEMPERATURE  - Sampling temperature (default: 0.1)
         OLLAMA_NUM_CTX      - Context window size (default: 2048)
+        OLLAMA_KEEP_ALIVE   - How long Ollama keeps the model loaded (default: 1h)
 
     UI Configuration:
         STREAMLIT_PORT      - Streamlit server port (default: 8501)
+        CHAT_HISTORY_LIMIT  - Chat messages kept per session (default: 100)
 
     Security Configuration:
         RFAI_USERNAME       - Authentication username (required)
@@ -52,6 +57,8 @@ except Exception:  # pragma: no cover - best-effort optional import
 PROJECT_ROOT = Path(__file__).resolve().parent
 TESTS_DIR = PROJECT_ROOT / "tests"
 RESULTS_DIR = PROJECT_ROOT / "results"
+# Local runtime data (e.g. the UI's chat history databases); gitignored.
+CACHE_DIR = PROJECT_ROOT / ".cache"
 
 # Best-effort load from PROJECT_ROOT/.env without overriding already-set env vars
 if load_dotenv is not None:
@@ -63,6 +70,9 @@ if load_dotenv is not None:
 MCP_SERVER_HOST = os.environ.get("MCP_SERVER_HOST", "127.0.0.1")
 MCP_SERVER_PORT = int(os.environ.get("MCP_SERVER_PORT", "8000"))
 MCP_SERVER_URL = f"http://{MCP_SERVER_HOST}:{MCP_SERVER_PORT}"
+# Only enable when the server runs under an HTTP/2-capable ASGI server
+# (uvicorn speaks HTTP/1.1 only); see mcp_server/server.py.
+MCP_HTTP2 = os.environ.get("MCP_HTTP2", "false").lower() in ("1", "true", "yes")
 
 # ---------------------------------------------------------------------------
 # Ollama Configuration
@@ -71,17 +81,31 @@ OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "localhost")
 OLLAMA_PORT = int(os.environ.get("OLLAMA_PORT", "11434"))
 OLLAMA_BASE_URL = f"http://{OLLAMA_HOST}:{OLLAMA_PORT}"
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "qwen2.5:32b-instruct-q4_k_m")
+# Optional two-model split: a small, fast model (e.g. qwen2.5:7b-instruct-q4_k_m)
+# decides which tool to call and the large model writes the answer after
+# tool results come back.  Both default to OLLAMA_MODEL (single model).
+OLLAMA_TOOL_MODEL = os.environ.get("OLLAMA_TOOL_MODEL", OLLAMA_MODEL)
+OLLAMA_CHAT_MODEL = os.environ.get("OLLAMA_CHAT_MODEL", OLLAMA_MODEL)
 
 # LLM parameters with sensible defaults
 # Temperature: 0.1 for more deterministic responses (good for tool calling)
 OLLAMA_TEMPERATURE = float(os.environ.get("OLLAMA_TEMPERATURE", "0.1"))
 # Context window: 2048 tokens is sufficient for most test-related queries
 OLLAMA_NUM_CTX = int(os.environ.get("OLLAMA_NUM_CTX", "2048"))
+# Keep-alive: keeps the weights and the system-prompt KV prefix resident between
+# turns.  Accepts a duration ("1h") or seconds; a negative number never unloads.
+_OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "1h")
+OLLAMA_KEEP_ALIVE: int | str = (
+    int(_OLLAMA_KEEP_ALIVE) if _OLLAMA_KEEP_ALIVE.lstrip("-").isdigit() else _OLLAMA_KEEP_ALIVE
+)
 
 # ---------------------------------------------------------------------------
 # UI Configuration
 # ---------------------------------------------------------------------------
 STREAMLIT_PORT = int(os.environ.get("STREAMLIT_PORT", "8501"))
+# Older messages are dropped from the session so each rerun re-renders a
+# bounded history; the full history stays in CACHE_DIR.
+CHAT_HISTORY_LIMIT = max(1, int(os.environ.get("CHAT_HISTORY_LIMIT", "100")))
 
 # ---------------------------------------------------------------------------
 # Security Configuration
@@ -99,14 +123,14 @@ TEST_EXECUTION_TIMEOUT = int(os.environ.get("TEST_EXECUTION_TIMEOUT", "120"))
 # ---------------------------------------------------------------------------
 # CORS Configuration
 # ---------------------------------------------------------------------------
-CORS_ORIGINS = [
+CORS_ORIGINS = (
     f"http://localhost:{STREAMLIT_PORT}",
     f"http://127.0.0.1:{STREAMLIT_PORT}",
     "http://localhost:3000",   # Development
     "http://127.0.0.1:3000",
-]
-CORS_METHODS = ["GET", "POST", "OPTIONS"]
-CORS_HEADERS = ["Content-Type", "Accept", "Authorization"]
+)
+CORS_METHODS = frozenset({"GET", "POST", "OPTIONS"})
+CORS_HEADERS = frozenset({"Content-Type", "Accept", "Authorization"})
 
 # ---------------------------------------------------------------------------
 # Logging Configuration
@@ -2,16 +2,27 @@
 FastAPI server that exposes the Robot Framework MCP tools over HTTP.
 
 Endpoints:
-    GET  /health                  — Health check.
+    GET  /health                  — Health check (HEAD also accepted).
     GET  /tools                   — List registered MCP tools.
     POST /tools/list_tests        — List available .robot test suites.
     POST /tools/execute           — Run a test suite by name.
     POST /tools/results           — Fetch latest parsed results.
     POST /tools/search_logs       — Search output.xml log messages.
 
+    Tool responses are compact JSON; add ``?pretty=1`` for indented output
+    when reading them by hand.
+
 Run:
     python -m mcp_server.server
     uvicorn mcp_server.server:app --host 127.0.0.1 --port 8000 --reload
+
+HTTP/2:
+    uvicorn only speaks HTTP/1.1.  To let the agent multiplex concurrent tool
+    calls over a single connection (MCP_HTTP2=true), serve the app with an
+    HTTP/2-capable ASGI server instead, e.g.:
+
+        pip install hypercorn "httpx[http2]"
+        hypercorn mcp_server.server:app --bind 127.0.0.1:8000
 """
 
 from __future__ import annotations
@@ -21,16 +32,14 @@ import logging
 import signal
 import sys
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
-from typing import Optional
+from typing import Annotated, Optional
 
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import re
+from fastapi.responses import JSONResponse, Response
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, StringConstraints
 
 from mcp_server.tools import (
     execute_test_suite,
@@ -49,6 +58,23 @@ from config import (
     VALID_LOG_LEVELS,
 )
 
+# orjson serialises responses several times faster than the stdlib; fall back
+# to Starlette's json-based JSONResponse when it is not installed.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+_JSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -62,93 +88,46 @@ logger = logging.getLogger("mcp_server.server")
 # ---------------------------------------------------------------------------
 # Input validation patterns (defense in depth against injection)
 # ---------------------------------------------------------------------------
-# Suite names must be simple identifiers — no paths, commands, or metacharacters
-SAFE_SUITE_NAME_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9_]{0,63}$")
-# Dangerous patterns that should never appear in any input
-DANGEROUS_PATTERNS = re.compile(r"[/\\;|&$`<>\"']|\.\.|\x00")
-# Note: VALID_LOG_LEVELS is imported from config
-
-
-def _validate_suite_name(value: str, field_name: str = "suite_name", allow_empty: bool = False) -> str:
-    """Validate suite name is safe — raises ValueError if suspicious."""
-    if not value:
-        if allow_empty:
-            return value
-        raise ValueError(f"{field_name} cannot be empty")
-    if DANGEROUS_PATTERNS.search(value):
-        raise ValueError(
-            f"{field_name} contains forbidden characters. "
-            "Only alphanumeric characters and underscores are allowed."
-        )
-    if not SAFE_SUITE_NAME_PATTERN.match(value):
-        raise ValueError(
-            f"{field_name} must start with a letter and contain only "
-            "alphanumeric characters and underscores (max 64 chars)."
-        )
-    return value
+# Suite names must be simple identifiers — no paths, commands, or metacharacters.
+# The pattern is enforced inside pydantic-core, and since only [A-Za-z0-9_] is
+# accepted it also rules out separators, shell metacharacters, quotes, "..",
+# and NUL bytes.
+SuiteName = Annotated[
+    str,
+    StringConstraints(pattern=r"^[a-zA-Z][a-zA-Z0-9_]{0,63}$", max_length=64),
+]
 
 
 class ExecuteRequest(BaseModel):
-    suite_name: str = Field(
+    suite_name: SuiteName = Field(
         ..., description="Stem of the .robot file, e.g. 'bitlocker_compliance'"
     )
 
-    @field_validator("suite_name")
-    @classmethod
-    def validate_suite_name(cls, v: str) -> str:
-        return _validate_suite_name(v, "suite_name")
-
 
 class ResultsRequest(BaseModel):
-    suite_name: Optional[str] = Field(
+    suite_name: Optional[SuiteName] = Field(
         default=None,
         description="Filter to a specific suite. Omit for the most recent result.",
     )
 
-    @field_validator("suite_name")
-    @classmethod
-    def validate_suite_name(cls, v: Optional[str]) -> Optional[str]:
-        if v is None:
-            return v
-        return _validate_suite_name(v, "suite_name")
+
+# Keywords can be more permissive but should not contain null bytes or be
+# excessively long.
+Keyword = Annotated[str, StringConstraints(max_length=200, pattern=r"^[^\x00]*$")]
+# Matched case-insensitively and upper-cased, so "fail" is accepted as FAIL.
+LogLevel = Annotated[
+    str,
+    StringConstraints(to_upper=True, pattern=rf"(?i)^({'|'.join(sorted(VALID_LOG_LEVELS))})$"),
+]
 
 
 class SearchLogsRequest(BaseModel):
-    keyword: str = Field(..., description="Case-insensitive substring to search for.")
-    log_level: str = Field(
+    keyword: Keyword = Field(..., description="Case-insensitive substring to search for.")
+    log_level: LogLevel = Field(
         default="FAIL",
         description="Minimum severity: FAIL, ERROR, WARN, INFO, DEBUG, or TRACE.",
     )
 
-    @field_validator("keyword")
-    @classmethod
-    def validate_keyword(cls, v: str) -> str:
-        # Keywords can be more permissive but should not contain null bytes or be excessively long
-        if "\x00" in v:
-            raise ValueError("keyword contains invalid characters")
-        if len(v) > 200:
-            raise ValueError("keyword is too long (max 200 characters)")
-        return v
-
-    @field_validator("log_level")
-    @classmethod
-    def validate_log_level(cls, v: str) -> str:
-        v_upper = v.upper()
-        if v_upper not in VALID_LOG_LEVELS:
-            raise ValueError(
-                f"log_level must be one of: {', '.join(sorted(VALID_LOG_LEVELS))}"
-            )
-        return v_upper
-
-class HealthResponse(BaseModel):
-    status: str = "ok"
-
-class ToolInfo(BaseModel):
-    name: str
-    description: str
-
-class ToolsListResponse(BaseModel):
-    tools: list[ToolInfo]
 
 # ---------------------------------------------------------------------------
 # Tool registry (for the /tools discovery endpoint)
@@ -185,6 +164,7 @@ app = FastAPI(
     description="HTTP wrapper around MCP tools for Robot Framework test management.",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=_JSONResponse,
 )
 
 # CORS — restricted to configured origins only (from config.py).
@@ -197,106 +177,100 @@ app.add_middleware(
     allow_headers=CORS_HEADERS,
 )
 
-# ---------------------------------------------------------------------------
-# Request-logging middleware
-# ---------------------------------------------------------------------------
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    ts = datetime.now(timezone.utc).isoformat()
-    logger.info("%s  %s %s", ts, request.method, request.url.path)
-    response = await call_next(request)
-    logger.info(
-        "%s  %s %s -> %s",
-        ts, request.method, request.url.path, response.status_code,
-    )
-    return response
-
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
 
-@app.get("/health", response_model=HealthResponse)
+@app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
     """Return server health status."""
-    return HealthResponse()
+    return {"status": "ok"}
 
 
-@app.get("/tools", response_model=ToolsListResponse)
-async def list_tools():
+@app.get("/tools")
+async def list_tools() -> Response:
     """Return the list of registered MCP tools."""
-    return ToolsListResponse(
-        tools=[ToolInfo(**t) for t in _TOOL_REGISTRY]
-    )
+    # The registry is already in the response shape; skip model validation.
+    return _JSONResponse({"tools": _TOOL_REGISTRY})
 
 
-def _safe_json_parse(raw: str) -> dict | list:
-    """Parse JSON string, returning error dict on failure.
+def _raw_json(raw: str, pretty: bool = False) -> Response:
+    """Send a tool's JSON string as-is, without decoding and re-encoding it.
 
     Args:
-        raw: JSON string to parse.
+        raw: JSON string returned by an MCP tool function.
+        pretty: Re-indent the JSON for humans (the ``?pretty=1`` query flag).
 
     Returns:
-        Parsed JSON object, or error dict if parsing fails.
+        Response with an application/json body.
     """
-    try:
-        return json.loads(raw)
-    except json.JSONDecodeError as exc:
-        logger.error("Failed to parse tool response as JSON: %s", exc)
-        return {"error": "Internal error: tool returned invalid JSON"}
+    if pretty:
+        raw = json.dumps(json.loads(raw), indent=2)
+    return Response(content=raw, media_type="application/json")
+
+
+# The tool endpoints are plain ``def`` functions: robot.run and the XML parsing
+# behind them block, so Starlette runs them in its threadpool and the event
+# loop stays free for /health and other requests.
 
 
 @app.post("/tools/list_tests")
-async def api_list_tests() -> JSONResponse:
+def api_list_tests(pretty: bool = False) -> Response:
     """List available Robot Framework test suites.
 
+    Args:
+        pretty: Indent the JSON response.
+
     Returns:
         JSON array of test suite objects with name, file, and description.
     """
     raw = list_available_tests()
-    return JSONResponse(content=_safe_json_parse(raw))
+    return _raw_json(raw, pretty)
 
 
 @app.post("/tools/execute")
-async def api_execute(req: ExecuteRequest) -> JSONResponse:
+def api_execute(req: ExecuteRequest, pretty: bool = False) -> Response:
     """Execute a test suite by name.
 
     Args:
         req: Request containing suite_name to execute.
+        pretty: Indent the JSON response.
 
     Returns:
         JSON object with execution results including status, passed/failed counts.
     """
     raw = execute_test_suite(req.suite_name)
-    return JSONResponse(content=_safe_json_parse(raw))
+    return _raw_json(raw, pretty)
 
 
 @app.post("/tools/results")
-async def api_results(req: ResultsRequest) -> JSONResponse:
+def api_results(req: ResultsRequest, pretty: bool = False) -> Response:
     """Fetch the latest parsed results.
 
     Args:
         req: Request with optional suite_name filter.
+        pretty: Indent the JSON response.
 
     Returns:
         JSON object with test results from the most recent output.xml.
     """
     raw = get_latest_results(req.suite_name or "")
-    return JSONResponse(content=_safe_json_parse(raw))
+    return _raw_json(raw, pretty)
 
 
 @app.post("/tools/search_logs")
-async def api_search_logs(req: SearchLogsRequest) -> JSONResponse:
+def api_search_logs(req: SearchLogsRequest, pretty: bool = False) -> Response:
     """Search output.xml log messages.
 
     Args:
         req: Request with keyword and log_level filters.
+        pretty: Indent the JSON response.
 
     Returns:
         JSON array of matching log entries with test context.
     """
     raw = search_test_logs(req.keyword, req.log_level)
-    return JSONResponse(content=_safe_json_parse(raw))
+    return _raw_json(raw, pretty)
 
 
 # ---------------------------------------------------------------------------
@@ -321,9 +295,14 @@ if __name__ == "__main__":
     print(f"  http://{MCP_SERVER_HOST}:{MCP_SERVER_PORT}/docs  (Swagger UI)")
     print("  Press Ctrl+C to stop\n")
 
+    # uvloop and httptools are markedly faster than asyncio and h11; uvloop is
+    # POSIX-only, so Windows keeps uvicorn's defaults.
+    speedups = {"loop": "uvloop", "http": "httptools"} if sys.platform != "win32" else {}
+
     uvicorn.run(
         "mcp_server.server:app",
         host=MCP_SERVER_HOST,
         port=MCP_SERVER_PORT,
         log_level=LOG_LEVEL.lower(),
+        **speedups,
     )
@@ -15,12 +15,17 @@ Usage:
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import mmap
+import os
+import re
+import threading
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from mcp.server.fastmcp import FastMCP
 
@@ -28,6 +33,20 @@ from robot import run as robot_run
 from robot.api import ExecutionResult
 from robot.errors import DataError
 
+# orjson encodes tool payloads several times faster than the stdlib; fall back
+# to json when it is not installed.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# lxml's C iterparse walks large output.xml files several times faster than
+# ElementTree; fall back to the stdlib parser when it is not installed.
+try:
+    from lxml import etree as LET
+except ImportError:  # pragma: no cover - optional speedup
+    LET = None
+
 from config import (
     LOG_FORMAT,
     PROJECT_ROOT,
@@ -36,6 +55,52 @@ from config import (
     VALID_LOG_LEVELS,
 )
 
+if LET is not None:
+    def _iterparse(path: Path):
+        # output.xml never needs entities resolved or network access.
+        # huge_tree lifts libxml2's 10 MB text-node limit: captured process
+        # output can exceed it, and ElementTree accepts such files.
+        return LET.iterparse(
+            str(path),
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+
+    def _release(elem, parent) -> None:
+        """Free a fully parsed element during iterparse.
+
+        lxml only allows removing earlier siblings (the parser still holds
+        the current element), so those are dropped from the parent here.
+        """
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    _XML_ERRORS: tuple[type[Exception], ...] = (ET.ParseError, LET.XMLSyntaxError)
+else:
+    def _iterparse(path: Path):
+        return ET.iterparse(path, events=("start", "end"))
+
+    def _release(elem, parent) -> None:
+        """Free a fully parsed element during iterparse.
+
+        ElementTree has no parent pointers, so the caller passes the open
+        *parent* (None at the root) and the element is detached from it.
+        """
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)
+
+    _XML_ERRORS = (ET.ParseError,)
+
+if orjson is not None:
+    def _dumps(data: dict | list) -> str:
+        return orjson.dumps(data).decode()
+else:
+    _dumps = json.dumps
+
 # Ensure the results directory exists so every tool can rely on it.
 RESULTS_DIR.mkdir(exist_ok=True)
 
@@ -65,37 +130,42 @@ mcp = FastMCP(
 # ---------------------------------------------------------------------------
 
 def _extract_suite_doc(robot_file: Path) -> str:
-    """Parse a .robot file and return the Suite-level Documentation value."""
+    """Parse a .robot file and return the Suite-level Documentation value.
+
+    The file is streamed and reading stops at the end of the Settings
+    section, so long test and keyword tables are never read.
+    """
     doc_lines: list[str] = []
     in_settings = False
     capturing = False
 
-    for raw_line in robot_file.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
+    with robot_file.open("r", encoding="utf-8") as fh:
+        for raw_line in fh:
+            line = raw_line.strip()
 
-        if line == "*** Settings ***":
-            in_settings = True
-            continue
-        if line.startswith("*** ") and in_settings:
-            break  # Left the Settings table
+            if line == "*** Settings ***":
+                in_settings = True
+                continue
+            if line.startswith("*** ") and in_settings:
+                break  # Left the Settings table
 
-        if not in_settings:
-            continue
+            if not in_settings:
+                continue
 
-        # Continuation line while already capturing documentation.
-        if capturing and line.startswith("..."):
-            doc_lines.append(line[3:].strip())
-            continue
-        elif capturing:
-            # First non-continuation line ends the Documentation value.
-            capturing = False
+            # Continuation line while already capturing documentation.
+            if capturing and line.startswith("..."):
+                doc_lines.append(line[3:].strip())
+                continue
+            elif capturing:
+                # First non-continuation line ends the Documentation value.
+                capturing = False
 
-        if line.lower().startswith("documentation"):
-            # Everything after the keyword (tab/space separated).
-            parts = line.split(None, 1)
-            if len(parts) > 1:
-                doc_lines.append(parts[1])
-            capturing = True
+            if line.lower().startswith("documentation"):
+                # Everything after the keyword (tab/space separated).
+                parts = line.split(None, 1)
+                if len(parts) > 1:
+                    doc_lines.append(parts[1])
+                capturing = True
 
     return " ".join(doc_lines).strip()
 
@@ -130,17 +200,47 @@ def _result_to_dict(result: object) -> dict:
     }
 
 
+def _parse_output(output_xml: Path) -> dict:
+    """Return a fresh copy of the parsed results in *output_xml*.
+
+    Parses are cached by modification time, so an unchanged file is read
+    only once; callers may add keys to the returned dict.
+    """
+    return dict(_parse_output_cached(str(output_xml), output_xml.stat().st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_output_cached(path: str, mtime_ns: int) -> dict:
+    return _result_to_dict(ExecutionResult(path))
+
+
 def _find_latest_output(suite_name: Optional[str] = None) -> Optional[Path]:
     """Return the most-recently modified output XML in results/."""
     if suite_name:
         target = RESULTS_DIR / suite_name / "output.xml"
         return target if target.is_file() else None
 
-    # Scan all sub-dirs for the newest output.xml.
-    candidates = sorted(
-        RESULTS_DIR.glob("*/output.xml"), key=lambda p: p.stat().st_mtime, reverse=True
-    )
-    return candidates[0] if candidates else None
+    # Scan all sub-dirs for the newest output.xml; a linear max(), no full sort.
+    newest = max(_iter_output_xmls(), default=None)
+    return newest[1] if newest else None
+
+
+def _iter_output_xmls() -> Iterator[tuple[int, Path]]:
+    """Yield ``(mtime_ns, path)`` for every results/<suite>/output.xml.
+
+    One scandir of results/ plus one stat per suite directory, instead of
+    Path.glob() followed by a separate stat() per match.
+    """
+    with os.scandir(RESULTS_DIR) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            path = os.path.join(entry.path, "output.xml")
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield st.st_mtime_ns, Path(path)
 
 
 # ---------------------------------------------------------------------------
@@ -159,10 +259,25 @@ def list_available_tests() -> str:
     logger.info("list_available_tests called")
 
     if not TESTS_DIR.is_dir():
-        return json.dumps({"error": f"Tests directory not found: {TESTS_DIR}"})
+        return _dumps({"error": f"Tests directory not found: {TESTS_DIR}"})
+
+    # Re-scan only when a .robot file is added, removed, or modified.
+    fingerprint = tuple(
+        sorted(
+            (p.name, st.st_mtime_ns, st.st_size)
+            for p in TESTS_DIR.glob("*.robot")
+            for st in (p.stat(),)
+        )
+    )
+    return _scan_suites(fingerprint)
+
 
+@functools.lru_cache(maxsize=1)
+def _scan_suites(fingerprint: tuple[tuple[str, int, int], ...]) -> str:
+    """Build the list_available_tests JSON for the files named in *fingerprint*."""
     suites: list[dict] = []
-    for robot_file in sorted(TESTS_DIR.glob("*.robot")):
+    for name, _mtime_ns, _size in fingerprint:
+        robot_file = TESTS_DIR / name
         suites.append(
             {
                 "name": robot_file.stem,
@@ -172,13 +287,18 @@ def list_available_tests() -> str:
         )
 
     logger.info("Found %d test suite(s)", len(suites))
-    return json.dumps(suites, indent=2)
+    return _dumps(suites)
 
 
 # ---------------------------------------------------------------------------
 # Tool 2: execute_test_suite
 # ---------------------------------------------------------------------------
 
+# robot.run keeps process-global state (logger, output capture), and the HTTP
+# server calls this tool from worker threads, so runs are serialised.
+_ROBOT_RUN_LOCK = threading.Lock()
+
+
 @mcp.tool()
 def execute_test_suite(suite_name: str) -> str:
     """Execute a Robot Framework test suite by name and return results as JSON.
@@ -195,7 +315,7 @@ def execute_test_suite(suite_name: str) -> str:
     robot_file = TESTS_DIR / f"{suite_name}.robot"
     if not robot_file.is_file():
         available = [f.stem for f in TESTS_DIR.glob("*.robot")]
-        return json.dumps(
+        return _dumps(
             {
                 "error": f"Suite '{suite_name}' not found",
                 "available_suites": available,
@@ -213,25 +333,26 @@ def execute_test_suite(suite_name: str) -> str:
     timestamp = datetime.now(timezone.utc).isoformat()
 
     try:
-        rc = robot_run(
-            str(robot_file),
-            output=str(output_xml),
-            log=str(log_html),
-            report=str(report_html),
-        )
+        with _ROBOT_RUN_LOCK:
+            rc = robot_run(
+                str(robot_file),
+                output=str(output_xml),
+                log=str(log_html),
+                report=str(report_html),
+            )
         logger.info("robot.run returned rc=%d", rc)
     except DataError as exc:
         # Robot Framework data/parsing error (e.g., invalid test file)
         logger.exception("robot.run raised DataError")
-        return json.dumps({"error": f"Test data error: {exc}", "timestamp": timestamp})
+        return _dumps({"error": f"Test data error: {exc}", "timestamp": timestamp})
     except OSError as exc:
         # File system errors (permissions, disk full, etc.)
         logger.exception("robot.run raised OSError")
-        return json.dumps({"error": f"File system error: {exc}", "timestamp": timestamp})
+        return _dumps({"error": f"File system error: {exc}", "timestamp": timestamp})
 
     # Parse output.xml for structured results.
     if not output_xml.is_file():
-        return json.dumps(
+        return _dumps(
             {
                 "error": "output.xml was not created — execution may have crashed",
                 "return_code": rc,
@@ -240,21 +361,20 @@ def execute_test_suite(suite_name: str) -> str:
         )
 
     try:
-        result = ExecutionResult(str(output_xml))
-        payload = _result_to_dict(result)
+        payload = _parse_output(output_xml)
         payload["return_code"] = rc
         payload["timestamp"] = timestamp
-        return json.dumps(payload, indent=2)
+        return _dumps(payload)
     except DataError as exc:
         # Robot Framework couldn't parse the output.xml
         logger.exception("Failed to parse output.xml: DataError")
-        return json.dumps(
+        return _dumps(
             {"error": f"Result parsing failed: {exc}", "return_code": rc, "timestamp": timestamp}
         )
     except ET.ParseError as exc:
         # XML parsing error
         logger.exception("Failed to parse output.xml: XML error")
-        return json.dumps(
+        return _dumps(
             {"error": f"Invalid XML in output.xml: {exc}", "return_code": rc, "timestamp": timestamp}
         )
 
@@ -278,7 +398,7 @@ def get_latest_results(suite_name: str = "") -> str:
 
     output_xml = _find_latest_output(name)
     if output_xml is None:
-        return json.dumps(
+        return _dumps(
             {
                 "error": "No output.xml found"
                 + (f" for suite '{name}'" if name else "")
@@ -287,24 +407,64 @@ def get_latest_results(suite_name: str = "") -> str:
         )
 
     try:
-        result = ExecutionResult(str(output_xml))
-        payload = _result_to_dict(result)
+        payload = _parse_output(output_xml)
         payload["source"] = str(output_xml.relative_to(PROJECT_ROOT))
-        return json.dumps(payload, indent=2)
+        return _dumps(payload)
     except DataError as exc:
         # Robot Framework couldn't parse the output.xml
         logger.exception("Failed to parse %s: DataError", output_xml)
-        return json.dumps({"error": f"Result parsing failed: {exc}"})
+        return _dumps({"error": f"Result parsing failed: {exc}"})
     except ET.ParseError as exc:
         # XML parsing error
         logger.exception("Failed to parse %s: XML error", output_xml)
-        return json.dumps({"error": f"Invalid XML in output.xml: {exc}"})
+        return _dumps({"error": f"Invalid XML in output.xml: {exc}"})
 
 
 # ---------------------------------------------------------------------------
 # Tool 4: search_test_logs
 # ---------------------------------------------------------------------------
 
+# Severity ordering for filtering.  Robot Framework always writes the level
+# attribute in upper case, so it is looked up as-is.
+_LEVEL_RANK = {"TRACE": 0, "DEBUG": 1, "INFO": 2, "WARN": 3, "ERROR": 4, "FAIL": 5}
+
+
+def _raw_keyword_pattern(keyword: str) -> Optional[re.Pattern[bytes]]:
+    """Return a bytes pattern that finds *keyword* in a raw output.xml, if one is safe.
+
+    Only printable ASCII keywords without XML-special characters appear
+    verbatim in the file (case folding then matches str.lower()); for
+    anything else, or an empty keyword, None is returned and no file is
+    pre-filtered.
+    """
+    if not keyword or not (keyword.isascii() and keyword.isprintable()):
+        return None
+    if any(c in keyword for c in "&<>\"'"):
+        return None
+    return re.compile(re.escape(keyword.encode("ascii")), re.IGNORECASE)
+
+
+def _raw_level_pattern(min_rank: int) -> Optional[re.Pattern[bytes]]:
+    """Return a bytes pattern for a ``level="..."`` attribute at or above *min_rank*.
+
+    A file without one has no message that can pass the level filter.  None
+    is returned for TRACE, where every message qualifies.
+    """
+    if min_rank == 0:
+        return None
+    levels = b"|".join(name.encode() for name, rank in _LEVEL_RANK.items() if rank >= min_rank)
+    return re.compile(rb"""level=["'](?:""" + levels + rb""")["']""")
+
+
+def _file_contains(path: Path, patterns: list[re.Pattern[bytes]]) -> bool:
+    """Scan the raw bytes of *path* for every one of *patterns* without parsing the XML."""
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return all(pattern.search(mm) is not None for pattern in patterns)
+        except ValueError:  # empty file cannot be mapped
+            return False
+
 
 @mcp.tool()
 def search_test_logs(keyword: str, log_level: str = "FAIL") -> str:
@@ -322,71 +482,70 @@ def search_test_logs(keyword: str, log_level: str = "FAIL") -> str:
     logger.info("search_test_logs called keyword=%r level=%r", keyword, level)
 
     if level not in VALID_LOG_LEVELS:
-        return json.dumps(
+        return _dumps(
             {"error": f"Invalid log_level '{log_level}'. Must be one of: {sorted(VALID_LOG_LEVELS)}"}
         )
 
     # Collect all output.xml files.
-    xml_files = sorted(RESULTS_DIR.glob("*/output.xml"), key=lambda p: p.stat().st_mtime, reverse=True)
+    xml_files = [path for _mtime, path in sorted(_iter_output_xmls(), reverse=True)]
     if not xml_files:
-        return json.dumps({"error": "No output.xml files found. Run execute_test_suite first."})
+        return _dumps({"error": "No output.xml files found. Run execute_test_suite first."})
 
-    # Severity ordering for filtering.
-    severity_order = ["TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FAIL"]
-    min_index = severity_order.index(level)
-    allowed_levels = set(severity_order[min_index:])
+    min_rank = _LEVEL_RANK[level]
 
-    keyword_lower = keyword.lower()
+    # Case-insensitive match in the regex engine, without lowercasing every message.
+    keyword_search = re.compile(re.escape(keyword), re.IGNORECASE).search
+    raw_patterns = [
+        p for p in (_raw_keyword_pattern(keyword), _raw_level_pattern(min_rank)) if p is not None
+    ]
     matches: list[dict] = []
 
     for xml_path in xml_files:
         suite_name = xml_path.parent.name
+        # Cheap rejection: skip the XML parse when the keyword, or any message
+        # at the requested level, is not in the file at all.
+        if raw_patterns and not _file_contains(xml_path, raw_patterns):
+            continue
+        # Stream the file instead of building the whole DOM: open elements
+        # and the names of the enclosing <test> elements are tracked on
+        # stacks, and every finished element is cleared and detached from its
+        # parent so memory stays bounded.
+        open_elems: list = []
+        tests: list[str] = []
+        found: list[dict] = []
         try:
-            tree = ET.parse(xml_path)
-        except ET.ParseError:
+            for event, elem in _iterparse(xml_path):
+                tag = elem.tag
+                if event == "start":
+                    open_elems.append(elem)
+                    if tag == "test":
+                        tests.append(elem.get("name", "(unknown)"))
+                    continue
+                open_elems.pop()
+
+                if tag == "msg":
+                    msg_level = elem.get("level")
+                    text = elem.text or ""
+                    if _LEVEL_RANK.get(msg_level, -1) >= min_rank and keyword_search(text):
+                        found.append(
+                            {
+                                "suite": suite_name,
+                                "test": tests[-1] if tests else "(suite-level)",
+                                "level": msg_level,
+                                "timestamp": elem.get("timestamp", ""),
+                                "message": text.strip(),
+                            }
+                        )
+                elif tag == "test":
+                    tests.pop()
+                _release(elem, open_elems[-1] if open_elems else None)
+        except _XML_ERRORS:
             logger.warning("Skipping malformed XML: %s", xml_path)
             continue
-
-        # Walk <msg> elements anywhere in the tree.
-        for msg_el in tree.iter("msg"):
-            msg_level = (msg_el.get("level") or "").upper()
-            if msg_level not in allowed_levels:
-                continue
-
-            text = msg_el.text or ""
-            if keyword_lower not in text.lower():
-                continue
-
-            # Walk up to find the enclosing <test> for context.
-            test_name = _find_ancestor_test_name(tree, msg_el)
-
-            matches.append(
-                {
-                    "suite": suite_name,
-                    "test": test_name,
-                    "level": msg_level,
-                    "timestamp": msg_el.get("timestamp", ""),
-                    "message": text.strip(),
-                }
-            )
+        matches.extend(found)
 
     logger.info("search_test_logs found %d match(es)", len(matches))
-    return json.dumps(matches, indent=2)
-
-
-def _find_ancestor_test_name(tree: ET.ElementTree, target: ET.Element) -> str:
-    """Walk the tree to find the <test name='...'> ancestor of *target*.
-
-    ElementTree elements don't have parent references, so we build a
-    child-to-parent map on the fly.
-    """
-    parent_map = {child: parent for parent in tree.iter() for child in parent}
-    node = target
-    while node is not None:
-        if node.tag == "test":
-            return node.get("name", "(unknown)")
-        node = parent_map.get(node)
-    return "(suite-level)"
+    return _dumps(matches)
 
 
 # ---------------------------------------------------------------------------
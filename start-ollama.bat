@@ -13,6 +13,12 @@ REM
 REM The server will run in this window. Press Ctrl+C to stop.
 REM ============================================================================
 
+REM Quantize the KV cache to 8 bits (requires flash attention). This halves
+REM KV-cache memory and bandwidth with negligible quality loss. Values already
+REM set in the environment take precedence.
+if not defined OLLAMA_FLASH_ATTENTION set OLLAMA_FLASH_ATTENTION=1
+if not defined OLLAMA_KV_CACHE_TYPE set OLLAMA_KV_CACHE_TYPE=q8_0
+
 echo Starting Ollama LLM server...
 echo.
 echo This provides the AI language model for the agent.
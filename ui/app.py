@@ -18,11 +18,17 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import json
 import logging
 import os
+import socket
+import sqlite3
 import sys
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Ensure the project root is on sys.path so "agent" and "mcp_server" are importable
 _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
@@ -31,10 +37,13 @@ if _PROJECT_ROOT not in sys.path:
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
 
 from config import (
     AUTH_PASSWORD,
     AUTH_USERNAME,
+    CACHE_DIR,
+    CHAT_HISTORY_LIMIT,
     HEALTH_CHECK_TIMEOUT,
     LOG_FORMAT,
     LOG_LEVEL,
@@ -57,6 +66,10 @@ st.set_page_config(
 logging.basicConfig(level=getattr(logging, LOG_LEVEL), format=LOG_FORMAT)
 logger = logging.getLogger("ui.app")
 
+# Expected credentials as bytes, encoded once for hmac.compare_digest.
+_AUTH_USER_B = (AUTH_USERNAME or "").encode()
+_AUTH_PASS_B = (AUTH_PASSWORD or "").encode()
+
 
 def _check_auth_configured() -> bool:
     """Check if authentication credentials are configured.
@@ -111,12 +124,10 @@ def check_password() -> bool:
     def password_entered() -> None:
         """Validate entered credentials using constant-time comparison."""
         username_correct = hmac.compare_digest(
-            st.session_state.get("username", "").encode(),
-            (AUTH_USERNAME or "").encode()
+            st.session_state.get("username", "").encode(), _AUTH_USER_B
         )
         password_correct = hmac.compare_digest(
-            st.session_state.get("password", "").encode(),
-            (AUTH_PASSWORD or "").encode()
+            st.session_state.get("password", "").encode(), _AUTH_PASS_B
         )
 
         if username_correct and password_correct:
@@ -147,7 +158,7 @@ def check_password() -> bool:
             if st.session_state.get("authenticated", False):
                 st.rerun()
 
-    if st.session_state.get("authenticated") == False:
+    if st.session_state.get("authenticated") is False:
         st.error("Invalid username or password")
 
     return False
@@ -156,112 +167,299 @@ def check_password() -> bool:
 # ---------------------------------------------------------------------------
 # Custom CSS
 # ---------------------------------------------------------------------------
+# A single constant emitted once per run.  It cannot be injected only once per
+# session: Streamlit drops any element a rerun does not re-create, so the
+# styling would disappear after the first interaction.
+_CSS = """
+<style>
+/* The toolbar is trimmed by client.toolbarMode in .streamlit/config.toml. */
+
+/* Chat message styling */
+.stChatMessage {
+    padding: 0.75rem 1rem;
+    border-radius: 0.75rem;
+    margin-bottom: 0.5rem;
+}
+
+/* Sidebar status badges */
+.status-ok {
+    color: #22c55e;
+    font-weight: 600;
+}
+.status-err {
+    color: #ef4444;
+    font-weight: 600;
+}
+
+/* Example prompt buttons */
+div.stButton > button {
+    width: 100%;
+    text-align: left;
+    border: 1px solid #e5e7eb;
+    border-radius: 0.5rem;
+    padding: 0.5rem 0.75rem;
+    margin-bottom: 0.25rem;
+    background: #f9fafb;
+    transition: background 0.15s;
+}
+div.stButton > button:hover {
+    background: #f3f4f6;
+    border-color: #6366f1;
+}
+</style>
+"""
+
 # ---------------------------------------------------------------------------
 # Authentication gate - must pass before showing any content
 # ---------------------------------------------------------------------------
 if not check_password():
     st.stop()
 
-st.markdown(
-    """
-    <style>
-    /* Hide default Streamlit header/footer/deploy for cleaner look */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    .stDeployButton {display: none;}
-
-    /* Chat message styling */
-    .stChatMessage {
-        padding: 0.75rem 1rem;
-        border-radius: 0.75rem;
-        margin-bottom: 0.5rem;
-    }
-
-    /* Sidebar status badges */
-    .status-ok {
-        color: #22c55e;
-        font-weight: 600;
-    }
-    .status-err {
-        color: #ef4444;
-        font-weight: 600;
-    }
-
-    /* Timestamp styling */
-    .msg-time {
-        font-size: 0.75rem;
-        color: #9ca3af;
-        margin-top: 0.25rem;
-    }
-
-    /* Example prompt buttons */
-    div.stButton > button {
-        width: 100%;
-        text-align: left;
-        border: 1px solid #e5e7eb;
-        border-radius: 0.5rem;
-        padding: 0.5rem 0.75rem;
-        margin-bottom: 0.25rem;
-        background: #f9fafb;
-        transition: background 0.15s;
-    }
-    div.stButton > button:hover {
-        background: #f3f4f6;
-        border-color: #6366f1;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+st.markdown(_CSS, unsafe_allow_html=True)
 
 
 # ---------------------------------------------------------------------------
 # Health-check helpers
 # ---------------------------------------------------------------------------
-def check_mcp_server() -> bool:
+@st.cache_resource
+def _http_session() -> requests.Session:
+    """Keep-alive HTTP session reused by the health checks across reruns."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def check_mcp_server(session: requests.Session) -> bool:
     """Return True if the MCP server /health endpoint responds.
 
+    Args:
+        session: HTTP session to send the probe on.  It is passed in because
+            the probe runs on a worker thread, where cached resources must
+            not be looked up.
+
     Returns:
         True if server is healthy, False otherwise.
     """
+    # HEAD: the server answers /health without a body.  A 405 still proves
+    # the server is up (an older server that only routes GET).
     try:
-        resp = requests.get(f"{MCP_SERVER_URL}/health", timeout=HEALTH_CHECK_TIMEOUT)
-        return resp.status_code == 200
+        resp = session.head(
+            f"{MCP_SERVER_URL}/health", timeout=HEALTH_CHECK_TIMEOUT, allow_redirects=False
+        )
+        return resp.ok or resp.status_code == 405
     except requests.RequestException:
         # Connection error, timeout, or other request failure
         return False
 
 
+def _host_port(url: str) -> tuple[str, int]:
+    """Return the (host, port) a base URL points at."""
+    parsed = urlparse(url)
+    return parsed.hostname or "localhost", parsed.port or (443 if parsed.scheme == "https" else 80)
+
+
+_OLLAMA_ADDR = _host_port(OLLAMA_BASE_URL)
+
+
+def _tcp_ok(addr: tuple[str, int]) -> bool:
+    """Return True if a TCP connection to *addr* can be opened."""
+    try:
+        with socket.create_connection(addr, timeout=HEALTH_CHECK_TIMEOUT):
+            return True
+    except OSError:
+        # Connection refused, timeout, or unresolvable host
+        return False
+
+
 def check_ollama() -> bool:
     """Return True if Ollama is reachable.
 
+    Only a TCP connect is attempted: /api/tags lists every installed model,
+    which is needlessly slow for an up/down indicator.
+
     Returns:
-        True if Ollama API responds, False otherwise.
+        True if Ollama accepts connections, False otherwise.
     """
-    try:
-        resp = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=HEALTH_CHECK_TIMEOUT)
-        return resp.status_code == 200
-    except requests.RequestException:
-        # Connection error, timeout, or other request failure
-        return False
+    return _tcp_ok(_OLLAMA_ADDR)
+
+
+@st.cache_resource
+def _probe_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every session for running health probes."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="health")
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _probe_all() -> tuple[bool, bool]:
+    """Probe the MCP server and Ollama concurrently.
+
+    Cached briefly so reruns don't re-probe every time.
+
+    Returns:
+        (mcp_ok, ollama_ok)
+    """
+    executor = _probe_executor()
+    mcp_future = executor.submit(check_mcp_server, _http_session())
+    ollama_future = executor.submit(check_ollama)
+    wait((mcp_future, ollama_future), timeout=HEALTH_CHECK_TIMEOUT + 1)
+    return (
+        mcp_future.done() and mcp_future.result(),
+        ollama_future.done() and ollama_future.result(),
+    )
 
 
 # ---------------------------------------------------------------------------
 # Agent initialisation (cached so it's created only once)
 # ---------------------------------------------------------------------------
+def _build_agent():
+    """Import the agent module and build its graph."""
+    from agent.agent import get_agent  # noqa: import here to avoid slow startup on every rerun
+
+    return get_agent()
+
+
+@st.cache_resource(show_spinner=False)
+def _agent_warmup() -> threading.Thread:
+    """Start building the agent in the background, once per process.
+
+    Called right after login so the LangChain/Ollama imports and graph
+    compilation are done by the time the first prompt is submitted.
+    """
+    thread = threading.Thread(target=_build_agent, name="agent-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 @st.cache_resource(show_spinner="Loading AI agent...")
 def load_agent():
     """Create and cache the LangChain agent."""
-    from agent.agent import get_agent  # noqa: import here to avoid slow startup on every rerun
+    # Let a warm-up still in flight finish rather than building a second graph.
+    _agent_warmup().join()
+    return _build_agent()
+
+
+_agent_warmup()
 
-    return get_agent()
+
+_PREVIEW_CHARS = 200
+
+
+def _preview(text: str) -> str:
+    """Return *text* cut to _PREVIEW_CHARS, with "..." when it was longer."""
+    if len(text) <= _PREVIEW_CHARS:
+        return text
+    return text[:_PREVIEW_CHARS] + "..."
+
+
+def _normalize_content(content) -> str:
+    """Return a message's content as text.
+
+    Some models return a list of blocks (strings or ``{"text": ...}`` dicts)
+    instead of a plain string; their text parts are joined with newlines.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block if isinstance(block, str) else block["text"]
+            for block in content
+            if isinstance(block, str) or (isinstance(block, dict) and block.get("text"))
+        )
+    return ""
+
+
+def _now() -> str:
+    """Return the current HH:MM, stored with a message as its timestamp."""
+    return time.strftime("%H:%M")
+
+
+# ---------------------------------------------------------------------------
+# Chat history store
+# ---------------------------------------------------------------------------
+class _ChatStore:
+    """Chat history kept in a small SQLite database.
+
+    Session state only holds the last CHAT_HISTORY_LIMIT messages for
+    rendering; the store keeps the full history, so it survives page
+    refreshes and restarts.  One connection is shared by every session of
+    the same user, so access goes through a lock.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY, role TEXT NOT NULL, content TEXT NOT NULL, "
+                "time TEXT, steps TEXT)"
+            )
+
+    def add(self, message: dict) -> None:
+        """Append *message* to the history."""
+        steps = message.get("steps")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO messages (role, content, time, steps) VALUES (?, ?, ?, ?)",
+                (
+                    message["role"],
+                    message["content"],
+                    message.get("time"),
+                    json.dumps(steps) if steps else None,
+                ),
+            )
+
+    def recent(self, limit: int) -> list[dict]:
+        """Return the last *limit* messages, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content, time, steps FROM messages ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {
+                "role": role,
+                "content": content,
+                "time": sent_at,
+                "steps": json.loads(steps) if steps else None,
+            }
+            for role, content, sent_at, steps in reversed(rows)
+        ]
+
+    def clear(self) -> None:
+        """Delete the whole history."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages")
+
+
+@st.cache_resource
+def _chat_store(username: str) -> _ChatStore:
+    """Return the history store for *username*, opened once per process."""
+    # Hash the name so it is safe to use in a file name.
+    digest = hashlib.sha256(username.encode()).hexdigest()[:16]
+    return _ChatStore(CACHE_DIR / f"chat_{digest}.db")
 
 
 # ---------------------------------------------------------------------------
 # Session state
 # ---------------------------------------------------------------------------
+# AUTH_USERNAME is the only account, so it keys the history.
+_store = _chat_store(AUTH_USERNAME)
+
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = _store.recent(CHAT_HISTORY_LIMIT)
+
+
+def _remember(message: dict) -> None:
+    """Store a chat message, keeping only the last CHAT_HISTORY_LIMIT in session."""
+    _store.add(message)
+    messages = st.session_state.messages
+    messages.append(message)
+    if len(messages) > CHAT_HISTORY_LIMIT:
+        del messages[:-CHAT_HISTORY_LIMIT]
 
 # ---------------------------------------------------------------------------
 # Sidebar
@@ -274,8 +472,7 @@ with st.sidebar:
 
     # --- Server status ---
     st.subheader("Server Status")
-    mcp_ok = check_mcp_server()
-    ollama_ok = check_ollama()
+    mcp_ok, ollama_ok = _probe_all()
 
     col1, col2 = st.columns(2)
     with col1:
@@ -289,6 +486,10 @@ with st.sidebar:
         else:
             st.markdown('<span class="status-err">Ollama LLM</span>', unsafe_allow_html=True)
 
+    if st.button("\u21bb Refresh status", use_container_width=True):
+        _probe_all.clear()
+        st.rerun()
+
     if not mcp_ok:
         st.warning("MCP server is not reachable. Start it with:\n\n`python -m mcp_server.server`")
     if not ollama_ok:
@@ -321,13 +522,15 @@ with st.sidebar:
 
     # --- Clear chat ---
     if st.button("\U0001f5d1 Clear Chat", use_container_width=True):
+        _store.clear()
         st.session_state.messages = []
         st.rerun()
 
     # --- Logout ---
     if st.button("\U0001f6aa Logout", use_container_width=True):
         st.session_state["authenticated"] = False
-        st.session_state.messages = []
+        # Reloaded from the store on the next login.
+        del st.session_state.messages
         st.rerun()
 
 # ---------------------------------------------------------------------------
@@ -336,174 +539,188 @@ with st.sidebar:
 st.title("\U0001f916 Robot Framework AI Assistant")
 st.markdown("Ask questions about your infrastructure tests in natural language.")
 
-# --- Warnings if services are down ---
-if not mcp_ok or not ollama_ok:
+# --- Chat is disabled while a backend is down ---
+# Submitting would only wait out the LLM/HTTP timeouts and then fail.
+services_ok = mcp_ok and ollama_ok
+if not services_ok:
     st.error(
         "One or more backend services are offline. "
-        "The agent may not work correctly until they are started."
+        "Chat is disabled until they are started; use \u21bb Refresh status to re-check."
     )
 
-# ---------------------------------------------------------------------------
-# Example prompt buttons (only shown when chat is empty)
-# ---------------------------------------------------------------------------
-if not st.session_state.messages:
-    st.markdown("#### Try an example:")
-    examples = [
-        "What tests are available?",
-        "Run the Windows services check",
-        "Show me recent test failures",
-        "What's our BitLocker compliance status?",
-    ]
-    cols = st.columns(2)
-    for idx, example in enumerate(examples):
-        with cols[idx % 2]:
-            if st.button(example, key=f"ex_{idx}"):
-                st.session_state.pending_prompt = example
-                st.rerun()
 
-# ---------------------------------------------------------------------------
-# Display chat history
-# ---------------------------------------------------------------------------
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        st.markdown(msg["content"])
-        if msg.get("time"):
-            st.markdown(f'<div class="msg-time">{msg["time"]}</div>', unsafe_allow_html=True)
-        # Show reasoning steps in an expandable section
-        if msg.get("steps"):
-            with st.expander("Agent reasoning steps"):
-                for step in msg["steps"]:
-                    st.text(step)
+_EXAMPLES: tuple[str, ...] = (
+    "What tests are available?",
+    "Run the Windows services check",
+    "Show me recent test failures",
+    "What's our BitLocker compliance status?",
+)
+
+
+def _queue_prompt(prompt: str) -> None:
+    """Button callback: have the next run submit *prompt* as the user input."""
+    st.session_state.pending_prompt = prompt
+
 
 # ---------------------------------------------------------------------------
-# Chat input — accept from text box or from pending example-button click
+# Chat panel
 # ---------------------------------------------------------------------------
-user_input = st.chat_input("Type your question here...")
-
-# If an example button was clicked on the previous run, pick it up now
-if user_input is None and st.session_state.get("pending_prompt"):
-    user_input = st.session_state.pop("pending_prompt")
+@st.fragment
+def _chat_panel() -> None:
+    """Render the examples, chat history, input box and the agent's reply.
 
-if user_input:
-    # Append user message
-    timestamp = datetime.now().strftime("%H:%M")
-    st.session_state.messages.append(
-        {"role": "user", "content": user_input, "time": timestamp}
-    )
+    Running as a fragment, submitting a prompt or clicking an example reruns
+    only this panel; the header, status probe and sidebar are left as they
+    are.  Sidebar actions (Clear Chat, Logout) still rerun the whole page.
+    """
+    # Example prompt buttons (only shown when chat is empty)
+    if not st.session_state.messages:
+        st.markdown("#### Try an example:")
+        cols = st.columns(2)
+        for idx, example in enumerate(_EXAMPLES):
+            with cols[idx % 2]:
+                # The callback queues the prompt before the rerun the click
+                # triggers, so it is answered in that run without an extra
+                # st.rerun().  Keying on the text keeps each button's identity
+                # stable if the list is reordered.
+                st.button(
+                    example,
+                    key=f"ex_{example}",
+                    disabled=not services_ok,
+                    on_click=_queue_prompt,
+                    args=(example,),
+                )
 
-    # Display user message immediately
-    with st.chat_message("user"):
-        st.markdown(user_input)
-        st.markdown(f'<div class="msg-time">{timestamp}</div>', unsafe_allow_html=True)
-
-    # Get agent response
-    with st.chat_message("assistant"):
-        with st.spinner("\U0001f914 Thinking..."):
-            try:
-                agent = load_agent()
-
-                # Stream the agent response, collecting intermediate steps
-                steps: list[str] = []
-                final_content = ""
-
-                for chunk in agent.stream(
-                    {"messages": [{"role": "user", "content": user_input}]},
-                    stream_mode="updates",
-                ):
-                    # Each chunk is a dict keyed by node name
-                    for node_name, node_output in chunk.items():
-                        if node_name == "agent":
-                            # Agent thinking / tool calls
-                            agent_msgs = node_output.get("messages", [])
-                            for am in agent_msgs:
-                                has_tool_calls = getattr(am, "tool_calls", None)
-                                if has_tool_calls:
-                                    for tc in has_tool_calls:
-                                        steps.append(
-                                            f"Calling tool: {tc['name']}({tc.get('args', {})})"
-                                        )
-                                # Capture content from agent messages.
-                                # The last agent message with content is the final answer.
-                                content = getattr(am, "content", None)
-                                # Handle list-style content (some models return structured blocks)
-                                if isinstance(content, list):
-                                    text_parts = []
-                                    for block in content:
-                                        if isinstance(block, str):
-                                            text_parts.append(block)
-                                        elif isinstance(block, dict) and block.get("text"):
-                                            text_parts.append(block["text"])
-                                    content = "\n".join(text_parts) if text_parts else ""
-                                if content and isinstance(content, str) and content.strip():
+    # Display chat history.  Inside a fragment the chat input is laid out
+    # inline rather than pinned to the page bottom, so the new turn is
+    # written into this container to keep it above the input box.
+    history = st.container()
+    for msg in st.session_state.messages:
+        with history.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+            if msg.get("time"):
+                st.caption(msg["time"])
+            # Show reasoning steps in an expandable section
+            if msg.get("steps"):
+                with st.expander("Agent reasoning steps"):
+                    for step in msg["steps"]:
+                        st.text(step)
+
+    # Chat input — accept from text box or from pending example-button click
+    user_input = st.chat_input("Type your question here...", disabled=not services_ok)
+
+    # If an example button was clicked on the previous run, pick it up now
+    if user_input is None and services_ok and st.session_state.get("pending_prompt"):
+        user_input = st.session_state.pop("pending_prompt")
+
+    if user_input:
+        # Append user message
+        sent_at = _now()
+        _remember({"role": "user", "content": user_input, "time": sent_at})
+
+        # Display user message immediately
+        with history.chat_message("user"):
+            st.markdown(user_input)
+            st.caption(sent_at)
+
+        # Get agent response
+        with history.chat_message("assistant"):
+            with st.spinner("\U0001f914 Thinking..."):
+                try:
+                    agent = load_agent()
+
+                    # Stream the agent response, collecting intermediate steps and
+                    # rendering progress and the answer as soon as they arrive
+                    steps: list[str] = []
+                    final_content = ""
+                    last_agent_content = ""
+                    answer_box = st.empty()
+
+                    for chunk in agent.stream(
+                        {"messages": [{"role": "user", "content": user_input}]},
+                        stream_mode="updates",
+                    ):
+                        # Each chunk is a dict keyed by node name
+                        for node_name, node_output in chunk.items():
+                            # LangChain 1.x agents name the LLM node "model"
+                            # (older prebuilt agents used "agent").  Middleware
+                            # nodes may report no output at all.
+                            if node_name in ("model", "agent"):
+                                # Agent thinking / tool calls
+                                agent_msgs = (node_output or {}).get("messages", [])
+                                for am in agent_msgs:
+                                    has_tool_calls = getattr(am, "tool_calls", None)
                                     if has_tool_calls:
-                                        # Agent is thinking before calling a tool
-                                        steps.append(f"Agent: {content[:200]}")
-                                    else:
-                                        # Final answer (no tool calls)
-                                        final_content = content
-
-                        elif node_name == "tools":
-                            # Tool responses
-                            tool_msgs = node_output.get("messages", [])
-                            for tm in tool_msgs:
-                                content = getattr(tm, "content", None)
-                                if content and isinstance(content, str):
-                                    preview = content[:200]
-                                    if len(content) > 200:
-                                        preview += "..."
-                                    steps.append(f"Tool result: {preview}")
-
-                # Fallback: if streaming didn't capture a final answer, use invoke()
-                if not final_content:
-                    logger.warning("Streaming did not capture final content, falling back to invoke()")
-                    result = agent.invoke(
-                        {"messages": [{"role": "user", "content": user_input}]}
+                                        for tc in has_tool_calls:
+                                            steps.append(
+                                                f"Calling tool: {tc['name']}({tc.get('args', {})})"
+                                            )
+                                        names = ", ".join(tc["name"] for tc in has_tool_calls)
+                                        answer_box.markdown(f"_Calling {names}..._")
+                                    # Capture content from agent messages.
+                                    # The last agent message with content is the final answer.
+                                    content = _normalize_content(getattr(am, "content", None))
+                                    if content.strip():
+                                        last_agent_content = content
+                                        if has_tool_calls:
+                                            # Agent is thinking before calling a tool
+                                            steps.append(f"Agent: {_preview(content)}")
+                                        else:
+                                            # Final answer (no tool calls)
+                                            final_content = content
+                                            answer_box.markdown(final_content)
+
+                            elif node_name == "tools":
+                                # Tool responses
+                                tool_msgs = (node_output or {}).get("messages", [])
+                                for tm in tool_msgs:
+                                    content = getattr(tm, "content", None)
+                                    if content and isinstance(content, str):
+                                        steps.append(f"Tool result: {_preview(content)}")
+
+                    # Never re-run the agent: fall back to the last text the model
+                    # produced, then to a static message.
+                    if not final_content:
+                        logger.warning("Streaming did not capture a final answer")
+                        final_content = (
+                            last_agent_content
+                            or "I wasn't able to generate a response. Please try again."
+                        )
+                        answer_box.markdown(final_content)
+
+                    answered_at = _now()
+                    st.caption(answered_at)
+
+                    if steps:
+                        with st.expander("Agent reasoning steps"):
+                            for step in steps:
+                                st.text(step)
+
+                    # Store assistant message
+                    _remember(
+                        {
+                            "role": "assistant",
+                            "content": final_content,
+                            "time": answered_at,
+                            "steps": steps if steps else None,
+                        }
                     )
-                    last_msg = result["messages"][-1]
-                    final_content = getattr(last_msg, "content", "") or ""
-                    if isinstance(final_content, list):
-                        parts = []
-                        for b in final_content:
-                            if isinstance(b, str):
-                                parts.append(b)
-                            elif isinstance(b, dict) and b.get("text"):
-                                parts.append(b["text"])
-                        final_content = "\n".join(parts)
-                if not final_content:
-                    final_content = "I wasn't able to generate a response. Please try again."
-
-                st.markdown(final_content)
-                resp_time = datetime.now().strftime("%H:%M")
-                st.markdown(
-                    f'<div class="msg-time">{resp_time}</div>',
-                    unsafe_allow_html=True,
-                )
 
-                if steps:
-                    with st.expander("Agent reasoning steps"):
-                        for step in steps:
-                            st.text(step)
-
-                # Store assistant message
-                st.session_state.messages.append(
-                    {
-                        "role": "assistant",
-                        "content": final_content,
-                        "time": resp_time,
-                        "steps": steps if steps else None,
-                    }
-                )
+                except Exception as exc:
+                    error_msg = f"An error occurred: {exc}"
+                    logger.error("Agent invocation failed: %s", exc, exc_info=True)
+                    st.error(error_msg)
+                    st.info(
+                        "Please check that the MCP server and Ollama are running, then try again."
+                    )
 
-            except Exception as exc:
-                error_msg = f"An error occurred: {exc}"
-                logger.error("Agent invocation failed: %s", exc, exc_info=True)
-                st.error(error_msg)
-                st.info("Please check that the MCP server and Ollama are running, then try again.")
-
-                st.session_state.messages.append(
-                    {
-                        "role": "assistant",
-                        "content": f"\u274c {error_msg}",
-                        "time": datetime.now().strftime("%H:%M"),
-                    }
-                )
+                    _remember(
+                        {
+                            "role": "assistant",
+                            "content": f"\u274c {error_msg}",
+                            "time": _now(),
+                        }
+                    )
+
+
+_chat_panel()